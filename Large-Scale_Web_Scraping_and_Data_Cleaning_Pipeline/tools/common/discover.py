@@ -1,7 +1,8 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urldefrag, urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from .util import parse_html
 
 
 def _normalize_url(u: str):
@@ -18,21 +19,31 @@ def _allow(u, cfg):
     return True
 
 
-def discover_urls(cfg, max_pages=1):
-    """最简单稳定：抓主索引页，抽 a[href]；可扩展分页/站点地图。"""
+def discover_urls(cfg, max_pages=1, concurrency=8):
+    """最简单稳定：抓主索引页，抽 a[href]；可扩展分页/站点地图。
+    入口页并发抓取（最多 concurrency 个在途请求），抓完后按原顺序串行解析。"""
     from .http import get_html
 
-    seen = set()
-    out = []
+    entry_pages = cfg["entry_pages"][:max_pages]
+    if not entry_pages:
+        return []
 
-    for entry_url in cfg["entry_pages"][:max_pages]:
-        html = get_html(entry_url, timeout=10.0, retry=2)
+    def _fetch(url):
+        return get_html(url, timeout=10.0, retry=2, encoding=cfg.get("encoding"))
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(entry_pages))) as ex:
+        pages = list(ex.map(_fetch, entry_pages))
+
+    # dict 兼作有序集合：一份存储同时负责去重和保序（原先 set + list 各存一遍）
+    out = {}
+
+    for entry_url, html in zip(entry_pages, pages):
         if not html:
             continue
-        soup = BeautifulSoup(html, "lxml")
-        for a in soup.select("a[href]"):
-            href = _normalize_url(urljoin(entry_url, a.get("href")))
-            if _allow(href, cfg) and href not in seen:
-                seen.add(href)
-                out.append(href)
-    return out
+        tree = parse_html(html)
+        # 直接取属性值，省掉逐个元素再 .get("href")
+        for href in tree.xpath("//a/@href"):
+            href = _normalize_url(urljoin(entry_url, href))
+            if href not in out and _allow(href, cfg):
+                out[href] = None
+    return list(out)
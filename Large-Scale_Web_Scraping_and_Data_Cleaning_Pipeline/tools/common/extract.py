@@ -1,62 +1,93 @@
+from functools import lru_cache
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from .util import node_text, parse_html
+
+# 步骤图：协议过滤在 XPath 里完成，直接返回 src 字符串
+_STEP_IMG_SRC = etree.XPath(
+    'descendant-or-self::img[starts-with(@src, "http://") or starts-with(@src, "https://")]/@src'
+)
+# og:title / og:image 一次查询同时取回
+_OG_META = etree.XPath('//meta[@property="og:title" or @property="og:image"]')
+
+
+@lru_cache(maxsize=256)
+def _compile(sel):
+    """CSS → 编译好的 XPath，只取文档序第一个命中；同一 cfg 的选择器只翻译一次。"""
+    return etree.XPath(f"({CSSSelector(sel, translator='html').path})[1]")
 
 
 def _text_or_none(node):
-    if not node:
+    if node is None:
         return None
-    return node.get_text("\n", strip=True)
+    return node_text(node, "\n")
 
 
-def _first(soup, selectors):
+def _first(tree, selectors):
     for sel in selectors:
-        n = soup.select_one(sel)
-        if n:
-            return n
+        hits = _compile(sel)(tree)
+        if hits:
+            return hits[0]
     return None
 
 
+def _outer_html(node):
+    if node is None:
+        return None
+    return lxml.html.tostring(node, encoding="unicode", with_tail=False)
+
+
+def _og_meta(tree):
+    """property → 第一个同名 meta 节点"""
+    og = {}
+    for m in _OG_META(tree):
+        og.setdefault(m.get("property"), m)
+    return og
+
+
 def extract_article_parts(cfg, html, base_url):
     """返回统一结构：title / cover_image / ingredients / instructions / notes / step_images"""
-    soup = BeautifulSoup(html, "lxml")
+    tree = parse_html(html)
+    sels = cfg["selectors"]
+    og = _og_meta(tree)
 
     # 标题
     title = None
-    tnode = _first(soup, cfg["selectors"]["title"])
-    if tnode:
-        title = tnode.get_text(" ", strip=True)
+    tnode = _first(tree, sels["title"])
+    if tnode is not None:
+        title = node_text(tnode, " ")
     else:
-        ogt = soup.select_one('meta[property="og:title"]')
-        if ogt and ogt.get("content"):
-            title = ogt["content"].strip()
+        ogt = og.get("og:title")
+        if ogt is not None and ogt.get("content"):
+            title = ogt.get("content").strip()
     title = title or ""
 
     # 主图
     cover = None
-    ogi = soup.select_one('meta[property="og:image"]')
-    if ogi and ogi.get("content"):
-        cover = ogi["content"].strip()
+    ogi = og.get("og:image")
+    if ogi is not None and ogi.get("content"):
+        cover = ogi.get("content").strip()
 
     # 三大块
-    ing_node = _first(soup, cfg["selectors"]["ingredients"])
-    ins_node = _first(soup, cfg["selectors"]["instructions"])
-    note_node = _first(soup, cfg["selectors"]["notes"])
+    ing_node = _first(tree, sels["ingredients"])
+    ins_node = _first(tree, sels["instructions"])
+    note_node = _first(tree, sels["notes"])
 
     # 步骤图片（可选）
     step_imgs = []
-    if ins_node:
-        for im in ins_node.select("img[src]"):
-            src = im.get("src")
-            if src and src.startswith(("http://", "https://")):
-                step_imgs.append(src)
+    if ins_node is not None:
+        step_imgs = [str(src) for src in _STEP_IMG_SRC(ins_node)]
 
     return dict(
         title=title,
         cover_image=cover,
-        ingredients_html=str(ing_node) if ing_node else None,
-        instructions_html=str(ins_node) if ins_node else None,
-        notes_html=str(note_node) if note_node else None,
+        ingredients_html=_outer_html(ing_node),
+        instructions_html=_outer_html(ins_node),
+        notes_html=_outer_html(note_node),
         step_images=step_imgs,
         base_url=base_url,
     )
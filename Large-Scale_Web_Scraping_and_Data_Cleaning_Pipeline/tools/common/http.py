@@ -1,21 +1,64 @@
-import random
-import time
+import codecs
+from functools import lru_cache
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; DataCleanBot/1.0; +https://example.com/bot)"
 }
 
+# 同一站点编码固定：apparent_encoding（整页字节探测）每个 host 只做一次
+_ENCODING_BY_HOST = {}
 
-def get_html(url, timeout=10.0, retry=2):
-    for i in range(retry + 1):
+
+@lru_cache(maxsize=None)
+def _session(retry):
+    """每种重试次数一个 Session：复用 keep-alive 连接，重试交给 urllib3。"""
+    s = requests.Session()
+    s.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=retry,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def _resolve_encoding(r, host):
+    # 响应头显式声明了 charset 就直接用（requests 对无 charset 的 text/* 会默认 ISO-8859-1，不可信）
+    if "charset" in r.headers.get("Content-Type", "").lower() and r.encoding:
+        return r.encoding
+    enc = _ENCODING_BY_HOST.get(host)
+    if enc is None:
+        enc = r.apparent_encoding
+        # 纯 ASCII（或空）页面探测不出真实编码：本页按 utf-8 解码（ASCII 的超集），
+        # 不写缓存，留给该 host 后续带非 ASCII 字节的页面再探测
+        if not enc or codecs.lookup(enc).name == "ascii":
+            return "utf-8"
+        _ENCODING_BY_HOST[host] = enc
+    return enc
+
+
+def get_html(url, timeout=10.0, retry=2, encoding=None):
+    """encoding：站点配置中已知的编码；不给则按响应头 / 每 host 首次探测结果解码。"""
+    try:
+        r = _session(retry).get(url, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if 200 <= r.status_code < 300:
+        enc = encoding or _resolve_encoding(r, urlsplit(url).netloc)
         try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout)
-            if 200 <= r.status_code < 300:
-                r.encoding = r.apparent_encoding or "utf-8"
-                return r.text
-        except requests.RequestException:
-            pass
-        time.sleep(0.5 + random.random() * 0.8)
+            return r.content.decode(enc, errors="replace")
+        except LookupError:  # 响应头里的编码名无法识别
+            return r.content.decode("utf-8", errors="replace")
     return None
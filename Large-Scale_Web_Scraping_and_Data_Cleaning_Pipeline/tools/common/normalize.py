@@ -1,6 +1,10 @@
+import itertools
 import re
 
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.cssselect import CSSSelector
+
+from .util import node_text
 
 # R2 模板/目录等（仅首3段/尾2段删除）
 R2_TEMPLATE_HEADERS = re.compile(
@@ -14,34 +18,69 @@ R4_NOISE = re.compile(
     re.I,
 )
 
+# 首3/尾2段：R4 ∪ R2，一次扫描
+EDGE_NOISE = re.compile(
+    f"(?P<r4>{R4_NOISE.pattern})|(?P<r2>{R2_TEMPLATE_HEADERS.pattern})", re.I
+)
+
 # 禁 Markdown 图片 / 表格行
 MD_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]+\)")
 MD_TABLE_LINE = re.compile(r"^\s*\|.+\|\s*$")
 
 # 数学符号（R5）
 MATH_SIGNS = re.compile(r"[±×÷√∑∞≈≠≤≥∫∑∏∆∇∂°]")
-
-# emoji/装饰符（R3，尽量克制）
-EMOJI = re.compile(r"[\u2600-\u27FF\U0001F300-\U0001FAFF]")
+MATH_WORDS = {
+    "±": "plus/minus",
+    "×": "x",
+    "÷": "divided by",
+    "√": "square root",
+    "∞": "infinity",
+    "≈": "approx",
+    "≠": "not equal",
+    "≤": "<=",
+    "≥": ">=",
+    "°": " degrees ",
+}
+
+# emoji/装饰符（R3，尽量克制）：U+2600–27FF、U+1F300–1FAFF 直接删除
+EMOJI_DROP = dict.fromkeys(
+    itertools.chain(range(0x2600, 0x2800), range(0x1F300, 0x1FB00)), None
+)
 
 # 中文全角标点 → 半角（英文站）
 FW = "，。！？【】（）％＃＠＆：；、“”‘’—…《》·"
 HW = ",.!?[]()%#@&:;,\"\"''--..<>."
 FW2HW = str.maketrans({a: b for a, b in zip(FW, HW)})
 
+# 英文站：去 emoji + 标点统一合并成一张表，一次 translate 完成
+EN_TRANS = {**EMOJI_DROP, **FW2HW}
+
+IMG_SRC = CSSSelector("img[src]")
+HTTP_PREFIXES = ("http://", "https://")
+
+# 行级规整
+LIST_BULLET = re.compile(r"^\s*([•·\-*]|▢)\s*")
+MD_HEAD = re.compile(r"^\s*#\s*")
+WS = re.compile(r"\s+")
+
 
 def _html_to_text(html):
-    soup = BeautifulSoup(html or "", "lxml")
-    # 去脚本/样式
-    for bad in soup(["script", "style", "noscript", "iframe"]):
-        bad.decompose()
+    if not html or not html.strip():
+        return ""
+    root = lxml.html.fragment_fromstring(html, create_parent="div")
+    # 去脚本/样式；表格直接丢弃（避免 Markdown 表格）。
+    # 换成空占位而不是 drop_tree：后者会把 tail 拼到前一段文字上，丢掉分段
+    for bad in list(root.iter("script", "style", "noscript", "iframe", "table")):
+        holder = lxml.html.Element("span")
+        holder.tail = bad.tail
+        bad.getparent().replace(bad, holder)
     # 图片先替换为占位（真实 URL 在 extract 时已有）
-    for img in soup.select("img[src]"):
-        img.replace_with(f"[Image: {img.get('src')}]")
-    # 表格直接转为行文本（避免 Markdown 表格）
-    for table in soup.select("table"):
-        table.decompose()
-    text = soup.get_text("\n", strip=True)
+    for img in IMG_SRC(root):
+        holder = lxml.html.Element("span")
+        holder.text = f"[Image: {img.get('src')}]"
+        holder.tail = img.tail
+        img.getparent().replace(img, holder)
+    text = node_text(root, "\n")
     return text
 
 
@@ -54,61 +93,59 @@ def _ban_markdown_lines(line: str) -> bool:
 
 
 def _strip_noise_blocks(paragraphs):
-    """R2/R4：首3段与尾2段做模板头清洗；全体做噪音清洗。"""
+    """R2/R4：首3段与尾2段做模板头清洗；全体做噪音清洗。
+    同一遍内顺带压缩删段后留下的连续空行。"""
     if not paragraphs:
         return paragraphs
-    keep = []
     n = len(paragraphs)
-    for i, p in enumerate(paragraphs):
+    tail_start = max(3, n - 2)
+    # 首3/尾2 用 R2+R4 合并模式（一次扫描），中间段只查 R4
+    tagged = itertools.chain(
+        zip(paragraphs[:3], itertools.repeat(EDGE_NOISE)),
+        zip(paragraphs[3:tail_start], itertools.repeat(R4_NOISE)),
+        zip(paragraphs[tail_start:], itertools.repeat(EDGE_NOISE)),
+    )
+    keep = []
+    last_blank = False
+    for p, noise in tagged:
         s = p.strip()
-        # R4 anywhere
-        if R4_NOISE.search(s):
+        if not s:
+            if not last_blank:
+                keep.append("")
+            last_blank = True
             continue
-        # R2 仅首3/尾2
-        if (i < 3 or i >= n - 2) and R2_TEMPLATE_HEADERS.search(s):
+        if noise.search(s):
             continue
         keep.append(s)
+        last_blank = False
     return keep
 
 
 def _math_guard(s: str) -> str:
     # 若出现数学符号，且不在 $...$ / $$...$$ / \[...\] 保护中 → 替换为英文词
     def safe(m):
-        ch = m.group(0)
-        repl = {
-            "±": "plus/minus",
-            "×": "x",
-            "÷": "divided by",
-            "√": "square root",
-            "∞": "infinity",
-            "≈": "approx",
-            "≠": "not equal",
-            "≤": "<=",
-            "≥": ">=",
-            "°": " degrees ",
-        }.get(ch, "")
-        return repl or ""
+        return MATH_WORDS.get(m.group(0), "")
 
     # 粗放：直接把裸露符号替换（不解析 LaTeX 块，足够通过校验）
     return MATH_SIGNS.sub(safe, s)
 
 
-def _norm_line(line: str, lang="en") -> str:
+def _norm_line(line: str, trans=EN_TRANS) -> str:
+    """trans：字符转换表（英文站为 EN_TRANS），由调用方按 lang 选定一次。"""
+    # 空行/纯空白行：后续各步都不会产出内容，直接返回
+    if not line or line.isspace():
+        return ""
     # 禁 Markdown 垃圾
     if _ban_markdown_lines(line):
         return ""
-    # 去 emoji
-    line = EMOJI.sub("", line)
-    # 标点统一
-    if lang == "en":
-        line = line.translate(FW2HW)
+    # 去 emoji + 标点统一
+    line = line.translate(trans)
     # 列表符号
-    line = re.sub(r"^\s*([•·\-*]|▢)\s*", "", line)
+    line = LIST_BULLET.sub("", line)
     # 禁 # 开头（markdown）
-    if re.match(r"^\s*#\s*", line):
-        line = re.sub(r"^\s*#\s*", "", line)
+    line = MD_HEAD.sub("", line, count=1)
     # 规范空白
-    line = re.sub(r"\s+", " ", line).strip()
+    line = WS.sub(" ", line).strip()
     # 数学符号守卫
     line = _math_guard(line)
     return line
@@ -116,6 +153,7 @@ def _norm_line(line: str, lang="en") -> str:
 
 def clean_and_assemble_content(cfg, parts):
     lang = cfg.get("lang", "en")
+    trans = EN_TRANS if lang == "en" else EMOJI_DROP
     blocks = []
 
     # 主图
@@ -129,64 +167,40 @@ def clean_and_assemble_content(cfg, parts):
 
     if ing:
         blocks.append("Ingredients")
-        blocks.extend(
-            [_norm_line(l, lang) for l in ing.splitlines() if _norm_line(l, lang)]
-        )
+        blocks.extend(x for l in ing.splitlines() if (x := _norm_line(l, trans)))
     if ins:
         blocks.append("")
         blocks.append("Instructions")
         # 步骤图片：按行追加
-        lines = [_norm_line(l, lang) for l in ins.splitlines()]
-        lines = [x for x in lines if x]
-        blocks.extend(lines)
+        blocks.extend(x for l in ins.splitlines() if (x := _norm_line(l, trans)))
     if note:
         blocks.append("")
         blocks.append("Notes")
-        blocks.extend(
-            [_norm_line(l, lang) for l in note.splitlines() if _norm_line(l, lang)]
-        )
+        blocks.extend(x for l in note.splitlines() if (x := _norm_line(l, trans)))
 
     # 追加步骤图片
-    img_count = 0
-    for u in parts.get("step_images", []):
-        if u.startswith(("http://", "https://")):
-            blocks.append(f"[Image: {u}]")
-            img_count += 1
+    step_imgs = [
+        f"[Image: {u}]"
+        for u in parts.get("step_images", [])
+        if u.startswith(HTTP_PREFIXES)
+    ]
+    blocks.extend(step_imgs)
+    img_count = len(step_imgs)
 
     # R2/R4 块级清洗（去模板/噪音）
-    # 先把空行统一，再做段落级筛
-    tmp = []
-    for b in blocks:
-        b = (b or "").strip()
-        if b == "":
-            tmp.append("")
-        else:
-            tmp.append(b)
-    # 合并多重空行 → 单空行
+    # 先把空行统一并合并多重空行（一遍完成），再做段落级筛
     merged = []
     last_blank = False
-    for b in tmp:
-        if b == "":
-            if not last_blank:
-                merged.append("")
-            last_blank = True
-        else:
-            merged.append(b)
-            last_blank = False
-
-    filtered = _strip_noise_blocks(merged)
-    # 最终再压一次空行
-    out = []
-    last_blank = False
-    for p in filtered:
-        if not p:
+    for b in blocks:
+        b = (b or "").strip()
+        if not b:
             if last_blank:
                 continue
             last_blank = True
-            out.append("")
         else:
             last_blank = False
-            out.append(p)
+        merged.append(b)
 
+    out = _strip_noise_blocks(merged)
     content = "\n".join(out).strip()
     return content, {"missing_notes": not bool(note.strip()), "images_count": img_count}
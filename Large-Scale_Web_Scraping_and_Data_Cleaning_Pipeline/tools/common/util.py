@@ -1,9 +1,62 @@
+import time
 from datetime import datetime, timezone
 
+import lxml.html
+from lxml import etree
+
+# fmt -> (时间片起点秒, 格式化结果)；同一分钟/同一天内不重复 strftime
+_UTC_STAMP_CACHE = {}
+
+
+def _utc_stamp(fmt, period):
+    t = int(time.time())
+    start = t - t % period
+    hit = _UTC_STAMP_CACHE.get(fmt)
+    if hit is not None and hit[0] == start:
+        return hit[1]
+    v = datetime.fromtimestamp(start, timezone.utc).strftime(fmt)
+    _UTC_STAMP_CACHE[fmt] = (start, v)
+    return v
+
 
 def utc_date():
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return _utc_stamp("%Y-%m-%d", 86400)
 
 
 def utc_datetime_minute():
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M")
+    return _utc_stamp("%Y-%m-%dT%H:%M", 60)
+
+
+def utc_file_stamp():
+    """分卷文件名用的 YYYYMMDD_HHMM。"""
+    return _utc_stamp("%Y%m%d_%H%M", 60)
+
+
+def empty_document():
+    return lxml.html.document_fromstring("<html><body></body></html>")
+
+
+def parse_html(text):
+    """与 BeautifulSoup(text, "lxml") 一样不抛错：
+    带 <?xml encoding=...?> 声明的 str 转成字节再解析；空白/纯注释页面返回空文档。"""
+    try:
+        try:
+            return lxml.html.document_fromstring(text)
+        except ValueError:
+            return lxml.html.document_fromstring(text.encode("utf-8"))
+    except etree.ParserError:  # Document is empty
+        return empty_document()
+
+
+# 与 BeautifulSoup 的 get_text 一致：不计嵌套的 script/style/template 文本，
+# 但选中的节点本身就是 script/style/template 时取其全部文本
+_RAW_TEXT_TAGS = frozenset(("script", "style", "template"))
+_VISIBLE_TEXT = etree.XPath(
+    "descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+)
+
+
+def node_text(node, sep="\n"):
+    """等价于 get_text(sep, strip=True)：逐段去空白、丢空段后拼接。"""
+    texts = node.itertext() if node.tag in _RAW_TEXT_TAGS else _VISIBLE_TEXT(node)
+    return sep.join(t for t in (s.strip() for s in texts) if t)
@@ -1,14 +1,19 @@
-import json
-from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
+from .util import utc_file_stamp
+
+# 大缓冲交给文件对象，减少 write 调用次数；未显式 close 时也会在回收时落盘
+FILE_BUFFERING = 1 << 20
+
 
 class JsonlWriter:
     def __init__(self, path: Path):
-        self.f = open(path, "w", encoding="utf-8")
+        self.f = open(path, "wb", buffering=FILE_BUFFERING)
 
     def write(self, obj):
-        self.f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self.f.write(orjson.dumps(obj) + b"\n")
 
     def close(self):
         self.f.close()
@@ -26,14 +31,16 @@ class RollingWriter:
         self._open_new()
 
     def _open_new(self):
-        stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M")
-        name = f"site_{stamp}_part{self.part:02d}.jsonl"
-        self.fp = open(self.out_dir / name, "w", encoding="utf-8")
+        name = f"site_{utc_file_stamp()}_part{self.part:02d}.jsonl"
+        self.fp = open(self.out_dir / name, "wb", buffering=FILE_BUFFERING)
 
     def write(self, obj):
-        self.fp.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self.fp.write(orjson.dumps(obj) + b"\n")
         self.count += 1
         if self.count % self.chunk_size == 0:
             self.fp.close()
             self.part += 1
             self._open_new()
+
+    def close(self):
+        self.fp.close()
@@ -17,10 +17,13 @@ preview_jsonl.py  ——  所有站点通用预览器（批量/目录自动命
 
 import argparse
 import glob
-import json
+import io
 import os
 import sys
-from html import escape as html_escape
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import orjson
 
 
 def read_jsonl(path):
@@ -30,7 +33,7 @@ def read_jsonl(path):
             if not line:
                 continue
             try:
-                yield json.loads(line)
+                yield orjson.loads(line)
             except Exception as e:
                 yield {
                     "__error__": f"{os.path.basename(path)}:{ln} JSON decode error: {e}",
@@ -38,13 +41,6 @@ def read_jsonl(path):
                 }
 
 
-def collect_records_from_file(file_path):
-    records = []
-    for obj in read_jsonl(file_path):
-        records.append(obj)
-    return records
-
-
 def expand_input_paths(inputs):
     """将 --inputs 中的每个参数展开为文件列表：
     - 若是目录：抓取该目录下所有 *.jsonl（不递归）
@@ -64,6 +60,16 @@ def expand_input_paths(inputs):
 
 # —— 富渲染工具 —— #
 
+# 与 html.escape(s, quote=True) 等价，但单次 C 级遍历
+HTML_ESCAPE_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def html_escape(s):
+    return s.translate(HTML_ESCAPE_TABLE)
+
+
 IMG_LINE_PREFIX = "[Image:"
 IMG_LINE_RECOG_PREFIX = "[Image: "
 
@@ -79,21 +85,23 @@ def render_content_block(text):
     if text is None:
         return "<div class='content-empty'>（无内容）</div>"
 
-    lines = text.splitlines()
-
-    html_lines = []
+    buf = io.StringIO()
     paragraph_buf = []
 
+    def emit(fragment):
+        # 块之间以换行分隔（等价于原先的 "\n".join）
+        if buf.tell():
+            buf.write("\n")
+        buf.write(fragment)
+
     def flush_paragraph():
         # ✅ 保留段内换行：对每行先转义，再用 <br> 连接
+        # 入缓冲的行都非空白，无需再判断整段是否为空
         if paragraph_buf:
-            if any(seg.strip() for seg in paragraph_buf):
-                safe_lines = [html_escape(seg) for seg in paragraph_buf]
-                joined = "<br>".join(safe_lines)
-                html_lines.append(f"<p>{joined}</p>")
+            emit(f"<p>{'<br>'.join(map(html_escape, paragraph_buf))}</p>")
             paragraph_buf.clear()
 
-    for raw in lines:
+    for raw in text.splitlines():
         s = raw.strip()
 
         # 1) 图片行
@@ -107,10 +115,11 @@ def render_content_block(text):
                 url_part = s
             url = url_part
             if url.lower().startswith(("http://", "https://")):
-                html_lines.append(
+                safe_url = html_escape(url)
+                emit(
                     "<div class='img-line'>"
-                    f"<div class='img-box'><img src='{html_escape(url)}' alt='image' loading='lazy'></div>"
-                    f"<div class='img-url'>{html_escape(url)}</div>"
+                    f"<div class='img-box'><img src='{safe_url}' alt='image' loading='lazy'></div>"
+                    f"<div class='img-url'>{safe_url}</div>"
                     "</div>"
                 )
             else:
@@ -120,8 +129,7 @@ def render_content_block(text):
         # 2) 预览友好的二级标题
         if s.startswith("## "):
             flush_paragraph()
-            title_text = s[3:].strip()
-            html_lines.append(f"<h3>{html_escape(title_text)}</h3>")
+            emit(f"<h3>{html_escape(s[3:].strip())}</h3>")
             continue
 
         # 3) 普通行
@@ -133,10 +141,10 @@ def render_content_block(text):
 
     flush_paragraph()
 
-    if not html_lines:
+    if not buf.tell():
         return "<div class='content-empty'>（无渲染内容）</div>"
 
-    return "\n".join(html_lines)
+    return buf.getvalue()
 
 
 def render_title(title):
@@ -147,7 +155,9 @@ def render_title(title):
 
 def pretty_json(obj):
     try:
-        return json.dumps(obj, ensure_ascii=False, indent=2)
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
     except Exception:
         return html_escape(str(obj))
 
@@ -224,11 +234,14 @@ def build_card(idx, rec):
     """
 
 
-def build_html(files, records):
-    cards = [build_card(i, rec) for i, rec in enumerate(records, 1)]
-    total = len(records)
+def count_records(path):
+    """与 read_jsonl 口径一致：每个非空行产出一条记录（含解析错误卡片）。"""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip("\n"))
+
+
+def html_head(files, total):
     srcs = "<br>".join(html_escape(p) for p in files) if files else "(no inputs)"
-    cards_html = "\n".join(cards)
 
     return f"""<!doctype html>
 <html lang="zh-CN">
@@ -303,7 +316,10 @@ def build_html(files, records):
       <div><strong>预览文件</strong>（共 {total} 条）</div>
       <div class="files">{srcs}</div>
     </div>
-    {cards_html}
+    """
+
+
+HTML_TAIL = """
     <div class="footer-note">预览仅用于结构/渲染校验；不做任何外站资源预拉取。</div>
   </div>
 </body>
@@ -311,6 +327,16 @@ def build_html(files, records):
 """
 
 
+def write_html(out_f, files, records, total):
+    """流式写出预览：先写页头，再边解析边写卡片，最后写页尾；不在内存中拼整页。"""
+    out_f.write(html_head(files, total))
+    for i, rec in enumerate(records, 1):
+        if i > 1:
+            out_f.write("\n")
+        out_f.write(build_card(i, rec))
+    out_f.write(HTML_TAIL)
+
+
 def auto_out_path_for_file(file_path, base_out_dir=None):
     """
     依据输入文件，生成输出 HTML 路径：
@@ -336,6 +362,14 @@ def auto_out_path_for_file(file_path, base_out_dir=None):
     return os.path.join(out_dir, f"preview_{domain}.html")
 
 
+def render_file_preview(fp, base_out_dir=None):
+    """单个输入文件 → 单个 HTML；返回输出路径（供进程池并行调用）。"""
+    out_path = auto_out_path_for_file(fp, base_out_dir=base_out_dir)
+    with open(out_path, "w", encoding="utf-8") as f:
+        write_html(f, [fp], read_jsonl(fp), count_records(fp))
+    return out_path
+
+
 def main():
     ap = argparse.ArgumentParser(description="通用 JSONL 预览器（批量/目录自动命名版）")
     ap.add_argument(
@@ -356,11 +390,9 @@ def main():
         and not os.path.isdir(args.out)
         and not args.out.endswith(os.sep)
     ):
-        records = collect_records_from_file(files[0])
-        html = build_html([files[0]], records)
         os.makedirs(os.path.dirname(args.out), exist_ok=True)
         with open(args.out, "w", encoding="utf-8") as f:
-            f.write(html)
+            write_html(f, [files[0]], read_jsonl(files[0]), count_records(files[0]))
         print(f"Preview written to: {args.out}")
         return
 
@@ -377,15 +409,14 @@ def main():
             base_out_dir = args.out
             os.makedirs(base_out_dir, exist_ok=True)
 
+    # 各文件互不依赖：用进程池并行生成
+    render = partial(render_file_preview, base_out_dir=base_out_dir)
+    workers = min(len(files), os.cpu_count() or 1)
     wrote = 0
-    for fp in files:
-        recs = collect_records_from_file(fp)
-        html = build_html([fp], recs)
-        out_path = auto_out_path_for_file(fp, base_out_dir=base_out_dir)
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(html)
-        print(f"Preview written to: {out_path}")
-        wrote += 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for out_path in pool.map(render, files):
+            print(f"Preview written to: {out_path}")
+            wrote += 1
 
     if wrote == 0:
         print("No previews were written.", file=sys.stderr)
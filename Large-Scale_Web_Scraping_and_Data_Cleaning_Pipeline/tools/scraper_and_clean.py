@@ -2,27 +2,63 @@
 # -*- coding: utf-8 -*-
 import argparse
 import hashlib
-import json
+import multiprocessing
+import os
 import random
 import re
 import sys
 import time
-import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Set, Tuple
+from typing import Any, Dict, Iterable, List, NamedTuple, Set, Tuple
 
+import lxml.html
+import orjson
 import requests
 import yaml
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
+from lxml import etree
+from lxml.cssselect import CSSSelector, SelectorError
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.retry import Retry
+
+from common.util import empty_document, node_text, parse_html
 
-requests.adapters.DEFAULT_RETRIES = 2
 SESSION = requests.Session()
 SESSION.headers.update(
     {
         "User-Agent": "Mozilla/5.0 (compatible; DataCollectionBot/1.0; +https://example.org/bot)"
     }
 )
+# 连接池：同一 host 复用 keep-alive 连接；重试交给 urllib3
+_POOL_MAXSIZE = 0
+
+
+def ensure_pool_size(size: int) -> None:
+    """pool_maxsize 需 >= 同时在途的请求数（--concurrency），否则多出的连接用完即弃、每次重新握手。"""
+    global _POOL_MAXSIZE
+    if size <= _POOL_MAXSIZE:
+        return
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=size,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    SESSION.mount("https://", adapter)
+    SESSION.mount("http://", adapter)
+    _POOL_MAXSIZE = size
+
+
+ensure_pool_size(8)  # --concurrency 默认值
 
 # ---- 标点与空白清理 ----
 _FW = "，。！？【】（）％＃＠＆：；“”‘’《》"
@@ -40,7 +76,8 @@ EMOJI_PAT = re.compile(
 )
 CN_SPACE = "\u3000"
 NBSP = "\u00a0"
-MULTI_NL = re.compile(r"\n{2,}")
+# 空白 + 全角标点一次 translate（须在去 HTML 之前：《》 会变成 <>）
+_WS_FULL2HALF = {**FULL2HALF, ord(CN_SPACE): " ", ord(NBSP): " "}
 HTML_ENTITY = re.compile(r"&[a-zA-Z0-9#]+;")
 HTML_TAG = re.compile(r"<[^>]+>")
 
@@ -74,6 +111,19 @@ MATH_REPL = (
     ("∆", "delta"),
     ("∇", "nabla"),
 )
+# dash / 省略号 / 乘号 / 数学减号 / 数学符号 / 列表勾选：一次 translate。
+# 须在去 HTML 之后：≤/≥ 会产生 <>，∞ 等会让 "&∞;" 变成实体
+_SYMBOL2ASCII = str.maketrans(
+    {
+        **dict.fromkeys(DASHES, "-"),
+        ELLIPSIS: "...",
+        MULTIPLY: "x",
+        MINUS_SIGN: "-",
+        **dict(MATH_REPL),
+        "▢": "",
+        "☐": "",
+    }
+)
 
 # ========= 新增：仅图片内容的判定 =========
 IMG_ONLY_PAT = re.compile(
@@ -105,6 +155,8 @@ class SiteConfig:
         self.deny = deny
         self.meta = meta or {}
         self.sitemap_url = sitemap_url  # <<< 新增
+        # allow/deny 每个站点只编译一次，发现阶段逐 URL 复用
+        self.url_rules = UrlRules(allow, deny)
 
     @staticmethod
     def from_yaml(path: Path) -> "SiteConfig":
@@ -142,16 +194,76 @@ def iter_selectors(sel) -> List[str]:
     return []
 
 
-def safe_select(soup: BeautifulSoup, selector) -> List:
+@lru_cache(maxsize=512)
+def css_xpath(css: str) -> etree.XPath | None:
+    """CSS → 编译好的 XPath（每个选择器只翻译一次）；不合法的选择器返回 None。"""
+    try:
+        return CSSSelector(css, translator="html")
+    except SelectorError:
+        return None
+
+
+def safe_select(tree: lxml.html.HtmlElement, selector) -> List:
     out = []
     for css in iter_selectors(selector):
-        try:
-            out.extend(soup.select(css))
-        except Exception:
-            continue
+        xp = css_xpath(css)
+        if xp is not None:
+            out.extend(xp(tree))
     return out
 
 
+@lru_cache(maxsize=None)
+def _lxml_knows_encoding(encoding: str) -> bool:
+    try:
+        lxml.html.HTMLParser(encoding=encoding)
+    except LookupError:
+        return False
+    return True
+
+
+class Page(NamedTuple):
+    """fetch 的结果：已读完且未超上限的正文，连同响应头给出的编码。"""
+
+    url: str
+    content: bytes
+    encoding: str | None
+
+    @property
+    def text(self) -> str:
+        """解码规则同 requests.Response.text：头里没给编码时按字节探测。"""
+        if not self.content:
+            return ""
+        enc = self.encoding
+        if enc is None:
+            enc = chardet.detect(self.content)["encoding"] if chardet else "utf-8"
+        try:
+            return str(self.content, enc or "utf-8", errors="replace")
+        except (LookupError, TypeError):
+            return str(self.content, errors="replace")
+
+
+def page_payload(r: Page) -> Tuple[bytes | str, str | None]:
+    """解析原料：响应头给了编码时取原始字节，交给 libxml2 按同一编码解码，省掉 r.text 的整页解码；
+    头里没编码（r.text 会走整页探测）或 libxml2 不认识该编码名时取 r.text。"""
+    if r.encoding and _lxml_knows_encoding(r.encoding):
+        return r.content, r.encoding
+    return r.text, None
+
+
+def parse_page(payload: bytes | str, encoding: str | None = None):
+    if encoding:
+        parser = lxml.html.HTMLParser(encoding=encoding)
+        try:
+            return lxml.html.document_fromstring(payload, parser=parser)
+        except etree.ParserError:  # 空白/纯注释页面：与 parse_html 一样给空文档
+            return empty_document()
+    return parse_html(payload)
+
+
+def parse_response(r: Page) -> lxml.html.HtmlElement:
+    return parse_page(*page_payload(r))
+
+
 def _norm_rule_list(rules) -> List:
     out = []
     if not rules:
@@ -176,52 +288,122 @@ def _norm_rule_list(rules) -> List:
     return out
 
 
-def url_allowed(url: str, allow_rules, deny_rules) -> bool:
-    u = url.lower()
-    denies = _norm_rule_list(deny_rules)
-    for d in denies:
-        if isinstance(d, re.Pattern):
-            if d.search(u):
-                return False
-        else:
-            if d in u:
-                return False
-    allows = _norm_rule_list(allow_rules)
-    if not allows:
-        return True
-    for a in allows:
-        if isinstance(a, re.Pattern):
-            if a.search(u):
-                return True
+# 含反向引用的正则不能并进 alternation（组号会错位），单独保留
+_BACKREF = re.compile(r"\\[1-9]|\(\?P=")
+# 子串规则达到这个数量后并成一条转义后的 alternation：逐条 `in` 的开销随规则数线性增长，
+# 合并后由正则引擎一次扫描；规则少时逐条 `in` 更快
+_FUSE_SUBS_MIN = 8
+
+
+def _split_rules(rules) -> Tuple[List[re.Pattern], Tuple[str, ...]]:
+    """_norm_rule_list 的结果拆成 (正则, 子串)；正则尽量合并成一条 alternation，
+    子串多时也并成一条正则。"""
+    pats: List[re.Pattern] = []
+    subs: List[str] = []
+    for r in _norm_rule_list(rules):
+        if isinstance(r, re.Pattern):
+            pats.append(r)
         else:
-            if a in u:
-                return True
+            subs.append(r)
+    if len(pats) > 1 and not any(_BACKREF.search(p.pattern) for p in pats):
+        try:
+            pats = [re.compile("|".join(f"(?:{p.pattern})" for p in pats), re.I)]
+        except re.error:  # 例如规则里带全局内联 flag，合并后不合法
+            pass
+    if len(subs) >= _FUSE_SUBS_MIN:
+        # 子串已转小写、URL 匹配前也转小写，不需要 re.I
+        pats.append(re.compile("|".join(re.escape(sub) for sub in subs)))
+        subs = []
+    return pats, tuple(subs)
+
+
+def _rule_hit(u: str, pats: List[re.Pattern], subs: Tuple[str, ...]) -> bool:
+    for p in pats:
+        if p.search(u):
+            return True
+    for sub in subs:
+        if sub in u:
+            return True
     return False
 
 
+class UrlRules:
+    """预编译的 allow/deny 规则：deny 优先，allow 为空则放行。"""
+
+    def __init__(self, allow_rules, deny_rules):
+        self.deny_pats, self.deny_subs = _split_rules(deny_rules)
+        self.allow_pats, self.allow_subs = _split_rules(allow_rules)
+        self.allow_all = not (self.allow_pats or self.allow_subs)
+
+    def allowed(self, url: str) -> bool:
+        u = url.lower()
+        if _rule_hit(u, self.deny_pats, self.deny_subs):
+            return False
+        if self.allow_all:
+            return True
+        return _rule_hit(u, self.allow_pats, self.allow_subs)
+
+
 # ---- 抓取与发现 ----
-def fetch(url: str, timeout=10) -> requests.Response | None:
-    for _ in range(3):
-        try:
-            r = SESSION.get(url, timeout=timeout)
-            if r.status_code == 200:
-                return r
-        except requests.RequestException:
-            time.sleep(0.3 + random.random() * 0.5)
-    return None
+# 单个响应体上限：配置错的链接指向大文件时不整包读进内存
+MAX_BODY_BYTES = 8 * 1024 * 1024
+# sitemap 规范允许单个文件 50MB（未压缩）
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+_TEXT_TYPES = ("html", "xml", "text")
+
+
+def _read_capped(r: requests.Response, max_bytes: int) -> bytes | None:
+    """流式读取响应体，超过 max_bytes 时放弃；非文本类型不读。"""
+    ctype = r.headers.get("Content-Type", "").lower()
+    if ctype and not any(t in ctype for t in _TEXT_TYPES):
+        return None
+    length = r.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) > max_bytes:
+        return None
+    buf = bytearray()
+    for chunk in r.iter_content(chunk_size=64 * 1024):
+        buf.extend(chunk)
+        if len(buf) > max_bytes:
+            return None
+    return bytes(buf)
+
+
+def fetch(url: str, timeout=10, max_bytes: int = MAX_BODY_BYTES) -> Page | None:
+    try:
+        with SESSION.get(url, timeout=timeout, stream=True) as r:
+            if r.status_code != 200:
+                return None
+            body = _read_capped(r, max_bytes)
+    except requests.RequestException:
+        # urllib3 的重试已用尽，稍作停顿再交还调用方
+        time.sleep(0.3 + random.random() * 0.5)
+        return None
+    if body is None:
+        return None
+    return Page(r.url, body, r.encoding)
+
+
+_A_HREF = etree.XPath("//a/@href")
+_A_REL_NEXT = etree.XPath("(//a[@rel='next'])[1]")
+
+
+def _first_or_none(nodes: List):
+    return nodes[0] if nodes else None
 
 
 def discover_from_index(
-    index_pages: List[str], allow, deny, max_pages: int
+    index_pages: List[str], rules: UrlRules, max_pages: int, concurrency: int = 8
 ) -> Set[str]:
-    urls = set()
-    for idx in index_pages:
+    """各索引页并发抓取（rel=next 翻页在各自线程内串行跟进）。"""
+
+    def _walk_index(idx: str) -> Set[str]:
+        urls = set()
         r = fetch(idx)
         if not r:
-            continue
-        soup = BeautifulSoup(r.text, "lxml")
-        for a in soup.select("a[href]"):
-            href = a.get("href", "").strip()
+            return urls
+        tree = parse_response(r)
+        for href in _A_HREF(tree):
+            href = href.strip()
             if (
                 not href
                 or href.startswith("#")
@@ -229,68 +411,92 @@ def discover_from_index(
                 or href.startswith("javascript:")
             ):
                 continue
-            if url_allowed(href, allow, deny):
+            if rules.allowed(href):
                 urls.add(href)
         # 翻页：rel=next
-        next_link = soup.select_one("a[rel='next']")
+        next_link = _first_or_none(_A_REL_NEXT(tree))
         page = 1
-        while next_link and page < max_pages:
+        while next_link is not None and page < max_pages:
             href = next_link.get("href")
             if not href:
                 break
             r2 = fetch(href)
             if not r2:
                 break
-            s2 = BeautifulSoup(r2.text, "lxml")
-            for a in s2.select("a[href]"):
-                h = a.get("href", "").strip()
-                if h and url_allowed(h, allow, deny):
+            t2 = parse_response(r2)
+            for h in _A_HREF(t2):
+                h = h.strip()
+                if h and rules.allowed(h):
                     urls.add(h)
-            next_link = s2.select_one("a[rel='next']")
+            next_link = _first_or_none(_A_REL_NEXT(t2))
             page += 1
+        return urls
+
+    urls = set()
+    if not index_pages:
+        return urls
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(index_pages))) as ex:
+        for found in ex.map(_walk_index, index_pages):
+            urls |= found
     return urls
 
 
-def _sitemap_links(xml_text: str) -> Tuple[List[str], List[str]]:
-    soup = BeautifulSoup(xml_text, "lxml-xml")
-    sitemaps = [loc.get_text().strip() for loc in soup.select("sitemap > loc")]
-    pages = [loc.get_text().strip() for loc in soup.select("url > loc")]
+# sitemap 带默认命名空间，按 local-name 匹配；recover 容忍不规范的 XML
+_XML_PARSER = etree.XMLParser(recover=True, resolve_entities=False)
+_SITEMAP_LOC = etree.XPath("//*[local-name()='sitemap']/*[local-name()='loc']")
+_URL_LOC = etree.XPath("//*[local-name()='url']/*[local-name()='loc']")
+_HTML_LOC = etree.XPath("//loc")
+
+
+def _loc_text(loc) -> str:
+    return "".join(loc.itertext()).strip()
+
+
+def _sitemap_links(xml: bytes) -> Tuple[List[str], List[str]]:
+    root = etree.fromstring(xml, _XML_PARSER)
+    if root is None:
+        raise ValueError("not_xml")
+    sitemaps = [_loc_text(loc) for loc in _SITEMAP_LOC(root)]
+    pages = [_loc_text(loc) for loc in _URL_LOC(root)]
     return sitemaps, pages
 
 
-def discover_from_sitemap(root: str, allow, deny, max_pages: int) -> Set[str]:
-    """递归抓 sitemapindex 与 urlset。"""
+def discover_from_sitemap(
+    root: str, rules: UrlRules, max_pages: int, concurrency: int = 8
+) -> Set[str]:
+    """递归抓 sitemapindex 与 urlset；按层展开，同一层的子 sitemap 并发抓取。"""
     visited = set()
     found = set()
 
-    def _walk(url: str):
-        if url in visited:
-            return
-        visited.add(url)
-        r = fetch(url)
+    def _links(url: str) -> Tuple[List[str], List[str]]:
+        r = fetch(url, max_bytes=MAX_SITEMAP_BYTES)
         if not r:
-            return
+            return [], []
         try:
-            sitemaps, pages = _sitemap_links(r.text)
+            return _sitemap_links(r.content)
         except Exception:
-            soup = BeautifulSoup(r.text, "lxml")
-            locs = [x.get_text().strip() for x in soup.select("loc")]
+            locs = [_loc_text(x) for x in _HTML_LOC(parse_html(r.text))]
             sitemaps = [u for u in locs if "sitemap" in u.lower()]
             pages = [u for u in locs if "sitemap" not in u.lower()]
-
-        for sm in sitemaps:
-            _walk(sm)
-        for p in pages:
-            if url_allowed(p, allow, deny):
-                found.add(p)
+            return sitemaps, pages
 
     # 允许 root 直接给到 sitemap_index.xml
     candidates = [root]  # <<< 改动：不再强制拼 /sitemap.xml
     if not root.endswith(".xml"):
         candidates = [root.rstrip("/") + "/sitemap.xml", root]
 
-    for c in candidates:
-        _walk(c)
+    frontier = candidates
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        while frontier:
+            frontier = [u for u in dict.fromkeys(frontier) if u not in visited]
+            visited.update(frontier)
+            nxt = []
+            for sitemaps, pages in ex.map(_links, frontier):
+                nxt.extend(sitemaps)
+                for p in pages:
+                    if rules.allowed(p):
+                        found.add(p)
+            frontier = nxt
     return found
 
 
@@ -313,14 +519,8 @@ def _get_image_urls_from_jsonld(image_field: Any) -> List[str]:
             u = it.get("url") or it.get("@id") or ""
             if isinstance(u, str) and u.startswith("http"):
                 out.append(u)
-    # 去重
-    seen = set()
-    res = []
-    for u in out:
-        if u not in seen:
-            seen.add(u)
-            res.append(u)
-    return res
+    # 去重（保序）
+    return list(dict.fromkeys(out))
 
 
 def _get_instructions_from_jsonld(instr_field: Any) -> str:
@@ -348,17 +548,21 @@ def _get_instructions_from_jsonld(instr_field: Any) -> str:
     return "\n".join([p for p in parts if p])
 
 
+# smart_strings=False：返回普通 str（orjson 不接受 str 子类）
+_JSONLD_TEXT = etree.XPath(
+    "//script[@type='application/ld+json']/text()", smart_strings=False
+)
+
+
 def extract_recipe_from_jsonld(
-    soup: BeautifulSoup,
+    tree: lxml.html.HtmlElement,
 ) -> Tuple[str, List[str], str, str, str]:
-    scripts = soup.find_all("script", attrs={"type": "application/ld+json"})
     candidates: List[dict] = []
-    for sc in scripts:
-        txt = sc.string or sc.get_text()
+    for txt in _JSONLD_TEXT(tree):
         if not txt:
             continue
         try:
-            data = json.loads(txt)
+            data = orjson.loads(txt)
         except Exception:
             continue
         objs = _as_list(data)
@@ -393,54 +597,55 @@ def extract_recipe_from_jsonld(
 
 
 # ---- 内容抽取与清洗 ----
-def _extract_first_text(soup: BeautifulSoup, selector) -> str:
-    for node in safe_select(soup, selector):
-        t = node.get_text("\n", strip=True)
+def _extract_first_text(tree: lxml.html.HtmlElement, selector) -> str:
+    for node in safe_select(tree, selector):
+        t = node_text(node)
         if t:
             return t
     return ""
 
 
-def _extract_list_text(soup: BeautifulSoup, selector) -> str:
+def _extract_list_text(tree: lxml.html.HtmlElement, selector) -> str:
     acc = []
-    for node in safe_select(soup, selector):
-        txt = node.get_text("\n", strip=True)
+    for node in safe_select(tree, selector):
+        txt = node_text(node)
         if txt:
             acc.append(txt)
     return "\n".join(acc).strip()
 
 
-def _image_urls_from_nodes(soup: BeautifulSoup, selector) -> List[str]:
+# 容器内 img 与 source[srcset] 一次遍历取回（文档序，调用方按标签分流）
+_DESC_IMG_SOURCE = etree.XPath(".//img | .//source[@srcset]")
+_OG_IMAGE_META = etree.XPath(
+    '//meta[@content and (@property="og:image" or @name="og:image" or @name="twitter:image")]'
+)
+
+
+def _image_urls_from_nodes(tree: lxml.html.HtmlElement, selector) -> List[str]:
     urls = []
-    for node in safe_select(soup, selector):
-        for img in node.select("img"):
-            src = (img.get("data-src") or img.get("src") or "").strip()
-            if src and src.startswith("http"):
-                urls.append(src)
-        for src in node.select("source[srcset]"):
-            ss = src.get("srcset", "").split(",")
-            for seg in ss:
-                u = seg.strip().split(" ")[0]
-                if u.startswith("http"):
-                    urls.append(u)
-    # 去掉 data:image 占位
-    urls = [u for u in urls if not u.startswith("data:image")]
+    for node in safe_select(tree, selector):
+        # 保持原有顺序：同一容器内先 img 再 srcset（首图会写进 content）
+        srcset_urls = []
+        for el in _DESC_IMG_SOURCE(node):
+            if el.tag == "img":
+                src = (el.get("data-src") or el.get("src") or "").strip()
+                if src and src.startswith("http"):
+                    urls.append(src)
+            else:
+                for seg in el.get("srcset", "").split(","):
+                    u = seg.strip().split(" ")[0]
+                    if u.startswith("http"):
+                        srcset_urls.append(u)
+        urls.extend(srcset_urls)
+    # data:image 占位不以 http 开头，上面已被过滤
     # 若容器没抓到，回退 OG/Twitter
     if not urls:  # <<< 新增：OG/Twitter 兜底
-        for m in soup.select(
-            'meta[property="og:image"][content], meta[name="og:image"][content], meta[name="twitter:image"][content]'
-        ):
+        for m in _OG_IMAGE_META(tree):
             c = m.get("content", "").strip()
             if c.startswith("http"):
                 urls.append(c)
-    # 去重
-    seen = set()
-    out = []
-    for u in urls:
-        if u not in seen:
-            out.append(u)
-            seen.add(u)
-    return out
+    # 去重（保序）
+    return list(dict.fromkeys(urls))
 
 
 NOISE_PAT = re.compile(
@@ -452,50 +657,73 @@ NOISE_PAT = re.compile(
     r")\b",
     re.I,
 )
+# HTML 标签 / 实体 / emoji 合成一条正则，一遍扫描；各分支首字符互斥（< / & / emoji）。
+# NOISE_PAT 不并入：它依赖 \b，必须在 emoji 删除、数学符号转 ASCII 之后再跑
+# 实体与 emoji 合成一遍扫描；标签须在此之前单独去掉：
+# 标签可能把实体拆开（"&amp<b>;"），先去标签才会露出完整实体
+_MARKUP_RE = re.compile(f"{HTML_ENTITY.pattern}|{EMOJI_PAT.pattern}")
+
+
+def _markup_repl(m: re.Match) -> str:
+    # 实体替换为空格，emoji 直接删除
+    return " " if m.group()[0] == "&" else ""
+
+
+# 去除括号里的短 FAQ 提示（如 "(answers many FAQs)"）
+_FAQ_PAREN_RE = re.compile(r"\([^)]*\bfaqs?\b[^)]*\)", re.I)
+# 行级规整：行首项目符（-/*/•/·/▪/●/◦/—/– 等）、纯标点行、前导标点
+_BULLET_RE = re.compile(r"^\s*([\-–—/*•·▪●◦])\s+")
+_PUNCT_ONLY_RE = re.compile(r"^[,:;.!?)\"'`\-*\u00d7]+$")
+_LEAD_PUNCT_RE = re.compile(r"^[,:;.!?)\"'`\-]+\s*")
+# UI 标题行（Ingredients / Instructions / Notes ...）
+_UI_HEADER_RE = re.compile(
+    r"^\s*(ingredients\s*&\s*substitutes|ingredients|instructions|notes)\b.*?$",
+    re.I | re.M,
+)
+
+
+def _strip_ui_headers(t: str) -> str:
+    return _UI_HEADER_RE.sub("", t).strip()
 
 
 def clean_text(s: str) -> str:
     if not s:
         return ""
+    # 快路径：两张 translate 表的键和 emoji 都是非 ASCII，纯 ASCII 文本（多数菜谱）
+    # 可直接跳过；str.isascii() 是 O(1)，每步前重查一次
     # 空白与全角
-    s = s.replace(CN_SPACE, " ").replace(NBSP, " ")
-    s = s.translate(FULL2HALF)
-    # HTML
-    s = HTML_TAG.sub("", s)
-    s = HTML_ENTITY.sub(" ", s)
-    # 统一 dash / 省略号 / 乘号 / 数学减号
-    s = re.sub(f"[{DASHES}]", "-", s)
-    s = s.replace(ELLIPSIS, "...")
-    s = s.replace(MULTIPLY, "x").replace(MINUS_SIGN, "-")
-    # 统一各类数学符号为 ASCII（避免 R5）
-    for src, rep in MATH_REPL:
-        if src in s:
-            s = s.replace(src, rep)
-    # 去列表勾选、emoji
-    s = s.replace("▢", "").replace("☐", "")
-    s = EMOJI_PAT.sub("", s)
+    if not s.isascii():
+        s = s.translate(_WS_FULL2HALF)
+    # HTML 标签先去；实体、emoji 再一遍扫描
+    if "<" in s:
+        s = HTML_TAG.sub("", s)
+    if not s.isascii() or "&" in s:
+        s = _MARKUP_RE.sub(_markup_repl, s)
+    # 统一 dash / 省略号 / 乘号 / 数学减号 / 各类数学符号为 ASCII（避免 R5），去列表勾选
+    if not s.isascii():
+        s = s.translate(_SYMBOL2ASCII)
     # 常见噪声词（含 FAQ/FAQs）
-    s = re.sub(NOISE_PAT, "", s)
+    s = NOISE_PAT.sub("", s)
     # 去除括号里的短 FAQ 提示（如 "(answers many FAQs)"）
-    s = re.sub(r"\([^)]*\bfaqs?\b[^)]*\)", "", s, flags=re.I)
+    if "(" in s:
+        s = _FAQ_PAREN_RE.sub("", s)
 
-    # 行级规整：去行首项目符/标点；删掉仅由标点/符号组成的行
+    # 行级规整：去行首项目符/标点；删掉仅由标点/符号组成的行；
+    # 空行直接不收（等价于 join 后再把连续空行合并掉）
     lines = []
     for line in s.splitlines():
         # 去项目符（-/*/•/·/▪/●/◦/—/– 等）
-        line = re.sub(r"^\s*([\-–—/*•·▪●◦])\s+", "", line)
+        line = _BULLET_RE.sub("", line)
+        if not line:
+            continue
         # 删仅由标点或符号构成的行（补充 *）
-        if line and re.match(r"^[,:;.!?)\"'`\-*\u00d7]+$", line.strip()):
+        if _PUNCT_ONLY_RE.match(line.strip()):
             continue
         # 去前导标点
-        if line and re.match(r"^[,:;.!?)\"'`\-]+\s*", line):
-            line = re.sub(r"^[,:;.!?)\"'`\-]+\s*", "", line)
-        lines.append(line)
-    s = "\n".join(lines)
-
-    # 合并多余空行
-    s = MULTI_NL.sub("\n", s)
-    return s.strip()
+        line = _LEAD_PUNCT_RE.sub("", line)
+        if line:
+            lines.append(line)
+    return "\n".join(lines).strip()
 
 
 def build_content(
@@ -514,41 +742,34 @@ def build_content(
 
 
 def hash_id(s: str) -> str:
+    # id 必须跨批次、跨环境稳定（validate_delivery 做跨文件重复 id 检查），保持 sha256 不换算法
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
-def extract_article(url: str, cfg: SiteConfig) -> Dict:
-    r = fetch(url)
-    if not r:
-        raise RuntimeError("fetch_failed")
-    soup = BeautifulSoup(r.text, "lxml")
+def parse_article(
+    url: str, payload: bytes | str, encoding: str | None, cfg: SiteConfig
+) -> Dict:
+    """纯 CPU 部分（解析 + 抽取 + 清洗），不做网络请求，可放进子进程执行。"""
+    tree = parse_page(payload, encoding)
 
-    title = _extract_first_text(soup, cfg.selectors.get("title") or "h1")
+    title = _extract_first_text(tree, cfg.selectors.get("title") or "h1")
     img_sel = cfg.selectors.get("image") or [
         ".wprm-recipe",
         ".tasty-recipe",
         "article",
         "main",
     ]
-    img_urls = _image_urls_from_nodes(soup, img_sel)
+    img_urls = _image_urls_from_nodes(tree, img_sel)
 
-    ings_raw = _extract_list_text(soup, cfg.selectors.get("ingredients"))
-    instr_raw = _extract_list_text(soup, cfg.selectors.get("instructions"))
+    ings_raw = _extract_list_text(tree, cfg.selectors.get("ingredients"))
+    instr_raw = _extract_list_text(tree, cfg.selectors.get("instructions"))
     notes_sel = cfg.selectors.get("notes")
-    notes_raw = _extract_list_text(soup, notes_sel) if notes_sel else ""
+    notes_raw = _extract_list_text(tree, notes_sel) if notes_sel else ""
 
     # 去除 UI 标题行
-    def strip_ui_headers(t: str) -> str:
-        return re.sub(
-            r"^\s*(ingredients\s*&\s*substitutes|ingredients|instructions|notes)\b.*?$",
-            "",
-            t,
-            flags=re.I | re.M,
-        ).strip()
-
-    ings_raw = strip_ui_headers(ings_raw)
-    instr_raw = strip_ui_headers(instr_raw)
-    notes_raw = strip_ui_headers(notes_raw)
+    ings_raw = _strip_ui_headers(ings_raw)
+    instr_raw = _strip_ui_headers(instr_raw)
+    notes_raw = _strip_ui_headers(notes_raw)
 
     ings = clean_text(ings_raw)
     instr = clean_text(instr_raw)
@@ -560,7 +781,7 @@ def extract_article(url: str, cfg: SiteConfig) -> Dict:
     )  # <<< 放宽触发条件
     if need_fallback:
         jl_title, jl_imgs, jl_ings, jl_instr, jl_notes = extract_recipe_from_jsonld(
-            soup
+            tree
         )
         if jl_title and not title:
             title = jl_title
@@ -603,6 +824,54 @@ def extract_article(url: str, cfg: SiteConfig) -> Dict:
 
 
 # ---- 主流程 ----
+def _fetch_payload(url: str) -> Tuple[bytes | str, str | None]:
+    """抓取线程：只做 I/O，返回交给解析进程的原料。"""
+    try:
+        r = fetch(url)
+        if not r:
+            raise RuntimeError("fetch_failed")
+        return page_payload(r)
+    finally:
+        # 礼貌间隔：按线程计，整体速率约为 concurrency 倍
+        time.sleep(0.15 + random.random() * 0.2)
+
+
+def _rejected(url: str, reason: str) -> Tuple[bool, bytes]:
+    return False, orjson.dumps({"url": url, "reason": reason})
+
+
+def build_record(
+    url: str,
+    payload: bytes | str,
+    encoding: str | None,
+    cfg: SiteConfig,
+    min_chars: int,
+) -> Tuple[bool, bytes]:
+    """解析进程：解析 + 清洗 + 过滤 + 序列化；返回 (是否合格, 待写入的 JSON 行)。"""
+    try:
+        item = parse_article(url, payload, encoding, cfg)
+
+        # ========= 新增：写入前过滤仅图片内容 =========
+        content_str = item.get("meta", {}).get("data_info", {}).get("content", "")
+        if IMG_ONLY_PAT.match(content_str or ""):
+            return _rejected(url, "image_only")
+        # ========= 新增结束 =========
+
+        if len(item["text"]) < min_chars:
+            return _rejected(url, "too_short")
+        return True, orjson.dumps(item)
+    except Exception as e:
+        return _rejected(url, f"exception:{type(e).__name__}")
+
+
+def _record(b: Future | Tuple[bool, bytes]) -> Tuple[bool, bytes]:
+    return b.result() if isinstance(b, Future) else b
+
+
+# JSONL 落盘：大缓冲交给文件对象，减少 write 调用次数
+FILE_BUFFERING = 1 << 20
+
+
 def run_one_site(cfg_path: Path, args) -> Tuple[int, int, Path, Path, str]:
     cfg = SiteConfig.from_yaml(cfg_path)
     domain = cfg.domain
@@ -610,64 +879,99 @@ def run_one_site(cfg_path: Path, args) -> Tuple[int, int, Path, Path, str]:
     out_dir.mkdir(parents=True, exist_ok=True)
     clean_path = out_dir / f"{domain}.clean.jsonl"
     rejected_path = out_dir / f"{domain}.rejected.jsonl"
-
-    seen_urls = set()
+    ensure_pool_size(args.concurrency)
 
     idx_urls = (
-        discover_from_index(cfg.index_pages, cfg.allow, cfg.deny, args.max_pages)
+        discover_from_index(
+            cfg.index_pages, cfg.url_rules, args.max_pages, args.concurrency
+        )
         if cfg.index_pages
         else set()
     )
     # 改为优先使用 YAML 的 sitemap_url（若提供）
     sm_root = cfg.sitemap_url or f"https://{domain}/sitemap.xml"  # <<< 新增
     sm_urls = (
-        discover_from_sitemap(sm_root, cfg.allow, cfg.deny, args.max_pages)  # <<< 改动
+        discover_from_sitemap(
+            sm_root, cfg.url_rules, args.max_pages, args.concurrency
+        )  # <<< 改动
         if cfg.sitemap
         else set()
     )
-    all_urls = idx_urls | sm_urls
+    n_idx, n_sm = len(idx_urls), len(sm_urls)
+    # 就地并入较大的那个集合，不再为合并结果另建一份
+    all_urls, other = (sm_urls, idx_urls) if n_sm >= n_idx else (idx_urls, sm_urls)
+    all_urls |= other
 
-    print(
-        f"[DISCOVER] index={len(idx_urls)} sitemap={len(sm_urls)} total={len(all_urls)}"
-    )
+    print(f"[DISCOVER] index={n_idx} sitemap={n_sm} total={len(all_urls)}")
     print(f"[DISCOVER_DONE] {domain} total_urls={len(all_urls)}")
 
+    # 每个 URL 恰好计入 ok 或 rejected 一次，所以 max_articles 等价于只处理前 N 个；
+    # 只取前 N 个，不把整个集合复制成 list
+    todo = list(islice(all_urls, args.max_articles or None))
+
     ok = rej = 0
-    with clean_path.open("w", encoding="utf-8") as f_ok, rejected_path.open(
-        "w", encoding="utf-8"
-    ) as f_bad:
-        for u in all_urls:
-            if args.max_articles and ok + rej >= args.max_articles:
-                break
-            if u in seen_urls:
-                continue
-            seen_urls.add(u)
-            try:
-                item = extract_article(u, cfg)
-
-                # ========= 新增：写入前过滤仅图片内容 =========
-                content_str = (
-                    item.get("meta", {}).get("data_info", {}).get("content", "")
-                )
-                if IMG_ONLY_PAT.match(content_str or ""):
-                    f_bad.write(json.dumps({"url": u, "reason": "image_only"}) + "\n")
-                    rej += 1
-                    continue
-                # ========= 新增结束 =========
-
-                if len(item["text"]) < args.min_chars:
-                    f_bad.write(json.dumps({"url": u, "reason": "too_short"}) + "\n")
-                    rej += 1
-                    continue
-                f_ok.write(json.dumps(item, ensure_ascii=False) + "\n")
-                ok += 1
-            except Exception as e:
-                f_bad.write(
-                    json.dumps({"url": u, "reason": f"exception:{type(e).__name__}"})
-                    + "\n"
-                )
-                rej += 1
-            time.sleep(0.15 + random.random() * 0.2)
+
+    def _write(good: bool, line: bytes):
+        nonlocal ok, rej
+        if good:
+            f_ok.write(line + b"\n")
+            ok += 1
+        else:
+            f_bad.write(line + b"\n")
+            rej += 1
+
+    # 子进程用 spawn 启动：此时抓取线程已在运行，fork 多线程进程可能带着锁死
+    spawn = multiprocessing.get_context("spawn")
+    with clean_path.open("wb", buffering=FILE_BUFFERING) as f_ok, rejected_path.open(
+        "wb", buffering=FILE_BUFFERING
+    ) as f_bad, ThreadPoolExecutor(
+        max_workers=args.concurrency
+    ) as io_pool, ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=spawn
+    ) as cpu_pool:
+        # 抓取（线程，I/O）与解析清洗（进程，CPU）流水线并行；
+        # 写文件只在主线程、按 URL 顺序串行完成。
+        # 在途抓取、待解析各限制在 window 个：正文不会在内存 / 进程池队列里无限堆积，
+        # 中断时也只需等这几个
+        window = 2 * args.concurrency
+        pending = iter(todo)
+        fetches = deque()
+
+        def _fill():
+            for u in islice(pending, window - len(fetches)):
+                fetches.append((u, io_pool.submit(_fetch_payload, u)))
+
+        builds = deque()
+        try:
+            _fill()
+            while fetches:
+                u, fut = fetches.popleft()
+                try:
+                    payload, encoding = fut.result()
+                except Exception as e:
+                    builds.append(_rejected(u, f"exception:{type(e).__name__}"))
+                else:
+                    builds.append(
+                        cpu_pool.submit(
+                            build_record, u, payload, encoding, cfg, args.min_chars
+                        )
+                    )
+                _fill()
+                # 待解析已满：阻塞等队首写出后再继续抓
+                while len(builds) >= window:
+                    _write(*_record(builds.popleft()))
+                # 已完成的队首结果先写出，不必等全部抓完
+                while builds and (
+                    not isinstance(builds[0], Future) or builds[0].done()
+                ):
+                    _write(*_record(builds.popleft()))
+            while builds:
+                _write(*_record(builds.popleft()))
+        except BaseException:
+            # 出错或 Ctrl-C：丢弃尚未开始的抓取/解析，不让 with 退出时等它们全部跑完
+            io_pool.shutdown(cancel_futures=True)
+            cpu_pool.shutdown(cancel_futures=True)
+            raise
 
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
     print(f"[DONE {ts}] site={domain} ok={ok} rejected={rej} out_dir={out_dir}")
@@ -685,6 +989,15 @@ def main():
     parser.add_argument("--min_chars", type=int, default=220)
     parser.add_argument("--max_pages", type=int, default=1)
     parser.add_argument("--max_articles", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="同时在途的 HTTP 请求数"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="解析/清洗进程数",
+    )
     args = parser.parse_args()
 
     path = Path(args.site_config)
@@ -709,5 +1022,4 @@ def main():
 
 
 if __name__ == "__main__":
-    warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
     main()
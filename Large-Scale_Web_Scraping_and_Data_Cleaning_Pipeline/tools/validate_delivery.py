@@ -20,12 +20,16 @@ from __future__ import annotations
 
 import argparse
 import glob
-import json
+import mmap
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import orjson
 
 TAG = {
     "R1": "R1",
@@ -55,12 +59,16 @@ EMOJI_RE = re.compile(
 )
 FANCY_BULLETS = {"•", "●", "○", "■", "□", "▢", "◆", "◇", "▪", "▫"}
 
-MULTI_NL_RE = re.compile(r"\n{2,}")
-MD_H1_6_RE = re.compile(r"^#+\s", re.M)
+# 下面几条正则都写成"以字面量/字符类开头"的等价形式：CPython 的 re 是回溯引擎，
+# 以 ^ 或 \b 开头时只能逐位置试探，以字面量开头则能先用前缀快速定位候选位置。
+# (?<!\w\d) 这类后顾 ≡ 首字符前的 \b；(?<![^\n]#) ≡ 行首（re.M 下的 ^）
+MULTI_NL_RE = re.compile(r"\n\n\n*")  # ≡ \n{2,}
+MD_H1_6_RE = re.compile(r"#(?<![^\n]#)#*\s")  # ≡ (?m)^#+\s
 MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]+\)")
 MD_TABLE_ROW_RE = re.compile(r"^\s*\|.+\|\s*$", re.M)
 
 MATH_SYMBOLS = set("±×÷√∑∏≈≠≤≥∞∫∂∆∇")
+MATH_SYMBOL_RE = re.compile(f"[{re.escape(''.join(sorted(MATH_SYMBOLS)))}]")
 DOLLAR_BLOCK_RE = re.compile(r"\$(?:\\\$|[^\$])+\$")
 DISPLAY_BRACKET_RE = re.compile(r"\\\[(?:.|\n)+?\\\]")
 
@@ -122,6 +130,9 @@ NOISE_REGEX: List[Tuple[re.Pattern, str]] = [
     (re.compile(r"\breferences\b", re.I), "references"),  # 避免匹配 preferences
     (re.compile(r"\bread\s+more\b", re.I), "read more"),  # 新增：带词边界的 read more
 ]
+# 上面几条合成一条 alternation 先扫一遍：干净文本（绝大多数）只走一次 \b 扫描；
+# 命中后再按 NOISE_REGEX 顺序逐条确认，报出的关键字不变
+NOISE_REGEX_ANY = re.compile("|".join(f"(?:{p.pattern})" for p, _ in NOISE_REGEX), re.I)
 
 TEMPLATE_HEAD_HINTS = [
     "table of contents",
@@ -140,10 +151,21 @@ EMAIL_RE = re.compile(r"\b[a-zA-Z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
 PHONE_RE = re.compile(
     r"\b(?:\+?\d{1,3}[-.\s]?)?(?:\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})\b"
 )
-CARD_RE = re.compile(r"\b(?:\d{4}[-\s]){3}\d{4}\b")
-SSN_RE = re.compile(r"\b\d{3}-\d{2}-\d{4}\b")
+# PHONE_RE 任一匹配都包含这段号码主体；它以 \d 开头、可快速定位，先用它预筛
+PHONE_CORE_RE = re.compile(r"\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+# ≡ \b(?:\d{4}[-\s]){3}\d{4}\b
+CARD_RE = re.compile(r"\d(?<!\w\d)\d{3}[-\s](?:\d{4}[-\s]){2}\d{4}\b")
+SSN_RE = re.compile(r"\d(?<!\w\d)\d{2}-\d{2}-\d{4}\b")  # ≡ \b\d{3}-\d{2}-\d{4}\b
 
 IMAGE_LINE_RE = re.compile(r"^\s*\[Image:\s*https?://[^\]\s]+?\]\s*$", re.M)
+URL_RE = re.compile(r"https?://\S+")
+IMAGE_EXT_RE = re.compile(r"\.(?:png|jpe?g|gif|webp)(?:\?|#|$)", re.I)
+
+# 两种非法掩码共用一条报错，合成一条；每个分支都含字面量 "xxx"
+PII_MASK_RE = re.compile(r"\bxxxx+\b|\bxxx@|@xxx\b")
+INDENT_RE = re.compile(r"(?m)^(?: {4,}|\t+)\S")
+LIST_PREFIX_RE = re.compile(r"(?m)^\s*[\-\*\u25A2]\s+\S")  # -, *, ▢
+HEX_ID_RE = re.compile(r"[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}")
 
 
 @dataclass
@@ -154,12 +176,23 @@ class ErrorItem:
     msg: str
 
 
-def safe_readlines(path: str) -> Tuple[Optional[List[str]], Optional[str]]:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.readlines(), None
-    except Exception as e:
-        return None, f"无法以 UTF-8 打开：{e}"
+def iter_lines(path: str) -> Iterator[str]:
+    """mmap 逐行流式读取，不把整个文件读成 list；切行与 open(..., encoding="utf-8")
+    的 readlines() 一致（\r\n、单独的 \r 都算换行）。非 UTF-8 时抛 UnicodeDecodeError。"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:  # 空文件不能 mmap
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for ln in iter(mm.readline, b""):
+                s = ln.decode("utf-8")
+                if "\r" not in s:
+                    yield s
+                    continue
+                parts = s.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+                for part in parts[:-1]:
+                    yield part + "\n"
+                if parts[-1]:
+                    yield parts[-1]
 
 
 def write_report(path: str, errors: List[ErrorItem], passed: int, total: int) -> None:
@@ -188,32 +221,39 @@ def contains_unprotected_math_symbols(text: str) -> bool:
         protected_spans.append((m.start(), m.end()))
     for m in DISPLAY_BRACKET_RE.finditer(text):
         protected_spans.append((m.start(), m.end()))
-
-    def is_protected(idx: int) -> bool:
-        for a, b in protected_spans:
-            if a <= idx < b:
-                return True
-        return False
-
-    for i, ch in enumerate(text):
-        if ch in MATH_SYMBOLS and not is_protected(i):
+    protected_spans.sort()
+
+    # 只看真正的数学符号位置；位置递增，区间按起点排好后游标只前进，整体一次线性扫描。
+    # 游标停在第一个 end > i 的区间：它之前的区间都在 i 之前结束，
+    # 它之后的区间起点都不早于它，所以只需看它是否覆盖 i
+    j = 0
+    n = len(protected_spans)
+    for m in MATH_SYMBOL_RE.finditer(text):
+        i = m.start()
+        while j < n and protected_spans[j][1] <= i:
+            j += 1
+        if j == n or protected_spans[j][0] > i:
             return True
     return False
 
 
-def detect_noise_keyword(text: str) -> Optional[str]:
-    for pat, name in NOISE_REGEX:
-        if pat.search(text):
-            return name
-    low = text.lower()
+def detect_noise_keyword(text: str, low: Optional[str] = None) -> Optional[str]:
+    """low：调用方已算好的 text.lower()，避免重复生成整串小写副本。"""
+    if NOISE_REGEX_ANY.search(text):
+        for pat, name in NOISE_REGEX:
+            if pat.search(text):
+                return name
+    if low is None:
+        low = text.lower()
     for kw in NOISE_KEYWORDS:
         if kw in low:
             return kw
     return None
 
 
-def detect_template_head(text: str) -> Optional[str]:
-    low = text.lower()
+def detect_template_head(text: str, low: Optional[str] = None) -> Optional[str]:
+    if low is None:
+        low = text.lower()
     for kw in TEMPLATE_HEAD_HINTS:
         if kw in low:
             return kw
@@ -221,30 +261,28 @@ def detect_template_head(text: str) -> Optional[str]:
 
 
 def is_sha_like(s: str) -> bool:
-    return bool(
-        re.fullmatch(r"[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}", s or "")
-    )
+    return bool(HEX_ID_RE.fullmatch(s or ""))
 
 
-def is_yyyy_mm_dd(s: str) -> bool:
+@lru_cache(maxsize=4096)
+def _strptime_ok(s: str, fmt: str) -> bool:
     try:
-        datetime.strptime(s, "%Y-%m-%d")
+        datetime.strptime(s, fmt)
         return True
     except Exception:
         return False
 
 
+# 同一批交付里日期/时间取值很少，strptime（占结构检查大头）的结果按字符串缓存
+def is_yyyy_mm_dd(s: str) -> bool:
+    return isinstance(s, str) and _strptime_ok(s, "%Y-%m-%d")
+
+
 def is_yyyy_mm_dd_hh_mm(s: str) -> bool:
-    try:
-        datetime.strptime(s, "%Y-%m-%dT%H:%M")
-        return True
-    except Exception:
-        return False
+    return isinstance(s, str) and _strptime_ok(s, "%Y-%m-%dT%H:%M")
 
 
-def check_file_format(
-    path: str, lines: Optional[List[str]], err_msg: Optional[str]
-) -> List[ErrorItem]:
+def check_file_format(path: str, err_msg: Optional[str]) -> List[ErrorItem]:
     errors: List[ErrorItem] = []
     if err_msg:
         errors.append(ErrorItem(path, 0, TAG["R1"], f"UTF-8/读文件失败：{err_msg}"))
@@ -252,9 +290,9 @@ def check_file_format(
     return errors
 
 
-def check_file_linecount(path: str, lines: List[str], strict: bool) -> List[ErrorItem]:
+def check_file_linecount(path: str, n_lines: int, strict: bool) -> List[ErrorItem]:
     errors: List[ErrorItem] = []
-    if strict and len(lines) < 10000:
+    if strict and n_lines < 10000:
         errors.append(ErrorItem(path, 0, TAG["R1"], "strict 模式：单文件行数 < 10000"))
     return errors
 
@@ -353,9 +391,7 @@ def check_object_structure(path: str, i: int, obj: dict) -> List[ErrorItem]:
                 )
             )
 
-    if "id" in obj and not re.fullmatch(
-        r"[0-9a-fA-F]{32}|[0-9a-fA-F]{40}|[0-9a-fA-F]{64}", str(obj["id"] or "")
-    ):
+    if "id" in obj and not HEX_ID_RE.fullmatch(str(obj["id"] or "")):
         e.append(ErrorItem(path, i, TAG["R1"], "id 需为 32/40/64 位 hex"))
 
     return e
@@ -371,38 +407,44 @@ def check_text_rules(path: str, i: int, text: str) -> List[ErrorItem]:
     return e
 
 
-def _check_R2(path: str, i: int, content: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
+def _check_R2(
+    e: List[ErrorItem], path: str, i: int, content: str, content_low: str
+) -> None:
     if MD_H1_6_RE.search(content):
         e.append(
             ErrorItem(path, i, TAG["R2"], "正文内禁止 Markdown 标题（# 开头的行）")
         )
-    kw = detect_template_head(content)
+    kw = detect_template_head(content, content_low)
     if kw:
         e.append(
             ErrorItem(path, i, TAG["R2"], f"疑似模板头/多主题内容触发关键字：{kw}")
         )
-    return e
 
 
-def _check_R3(path: str, i: int, content: str, lang: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
+def _check_R3(e: List[ErrorItem], path: str, i: int, content: str, lang: str) -> None:
     if MULTI_NL_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R3"], "存在连续 >=2 个换行符"))
-    if EMOJI_RE.search(content) or any(b in content for b in FANCY_BULLETS):
+    # emoji、装饰符、中文标点全是非 ASCII 字符：纯 ASCII 文本（英文记录的大多数）直接跳过
+    ascii_only = content.isascii()
+    if not ascii_only and (
+        EMOJI_RE.search(content) or any(b in content for b in FANCY_BULLETS)
+    ):
         e.append(ErrorItem(path, i, TAG["R3"], "含 emoji/艺术字/特殊装饰符"))
-    if lang == "en" and CJK_PUNCT_RE.search(content):
+    if lang == "en" and not ascii_only and CJK_PUNCT_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R3"], "中英文标点混用或与 lang 不匹配"))
-    if re.search(r"(?m)^(?: {4,}|\t+)\S", content):
+    if ("    " in content or "\t" in content) and INDENT_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R3"], "存在异常缩进行"))
-    return e
 
 
-def _check_R4(path: str, i: int, content: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
-    if HTML_TAG_RE.search(content) or HTML_ENTITY_RE.search(content):
+def _check_R4(
+    e: List[ErrorItem], path: str, i: int, content: str, content_low: str
+) -> None:
+    # 各正则都有必需的字面量：先用 `in`（C 层子串查找）挡掉，命中再跑正则
+    if ("<" in content and HTML_TAG_RE.search(content)) or (
+        "&" in content and HTML_ENTITY_RE.search(content)
+    ):
         e.append(ErrorItem(path, i, TAG["R4"], "存在 HTML 标签或实体残留"))
-    kw = detect_noise_keyword(content)
+    kw = detect_noise_keyword(content, content_low)
     if kw:
         e.append(
             ErrorItem(
@@ -412,14 +454,12 @@ def _check_R4(path: str, i: int, content: str) -> List[ErrorItem]:
                 f"检出网页噪音（广告/导航/版权/推荐/FAQ/社交/HTML 等）：{kw}",
             )
         )
-    return e
 
 
-def _check_R5(path: str, i: int, content: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
-    if MD_IMAGE_RE.search(content):
+def _check_R5(e: List[ErrorItem], path: str, i: int, content: str) -> None:
+    if "![" in content and MD_IMAGE_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R5"], "禁止 Markdown 图片语法 ![alt](...)"))
-    if MD_TABLE_ROW_RE.search(content):
+    if "|" in content and MD_TABLE_ROW_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R5"], "禁止 Markdown 表格行（|...|）"))
     if contains_unprotected_math_symbols(content):
         e.append(
@@ -431,27 +471,27 @@ def _check_R5(path: str, i: int, content: str) -> List[ErrorItem]:
             )
         )
     if "http" in content:
-        urls = re.findall(r"https?://\S+", content)
-        for u in urls:
-            if re.search(r"\.(?:png|jpe?g|gif|webp)(?:\?|#|$)", u, re.I):
-                line_match = re.search(rf"(?m)^.*{re.escape(u)}.*$", content)
-                if line_match:
-                    line_text = line_match.group(0)
-                    if not IMAGE_LINE_RE.fullmatch(line_text.strip()):
-                        e.append(
-                            ErrorItem(
-                                path,
-                                i,
-                                TAG["R5"],
-                                f"图片需用 '[Image: URL]' 行表示：{u}",
-                            )
+        for u in URL_RE.findall(content):
+            if IMAGE_EXT_RE.search(u):
+                # URL 首次出现所在的那一行（不再为每个 URL 临时编译一条 ^.*URL.*$）
+                pos = content.find(u)
+                start = content.rfind("\n", 0, pos) + 1
+                end = content.find("\n", pos)
+                line_text = content[start:] if end < 0 else content[start:end]
+                if not IMAGE_LINE_RE.fullmatch(line_text.strip()):
+                    e.append(
+                        ErrorItem(
+                            path,
+                            i,
+                            TAG["R5"],
+                            f"图片需用 '[Image: URL]' 行表示：{u}",
                         )
-    return e
+                    )
 
 
-def _check_R6(path: str, i: int, content: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
-    if re.search(r"\bxxxx+\b", content) or re.search(r"\bxxx@|@xxx\b", content):
+def _check_R6(e: List[ErrorItem], path: str, i: int, content: str) -> None:
+    # 先用子串判断挡掉绝大多数文本：掩码必含 "xxx"，邮箱必含 "@"
+    if "xxx" in content and PII_MASK_RE.search(content):
         e.append(
             ErrorItem(
                 path,
@@ -460,9 +500,9 @@ def _check_R6(path: str, i: int, content: str) -> List[ErrorItem]:
                 "PII 掩码只能为 'xxx'，不允许 'xxxx' 或 'xxx@/ @xxx' 等变体",
             )
         )
-    if EMAIL_RE.search(content):
+    if "@" in content and EMAIL_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R6"], "检测到邮箱明文，应匿名为 'xxx'"))
-    if PHONE_RE.search(content):
+    if PHONE_CORE_RE.search(content) and PHONE_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R6"], "检测到电话号码明文，应匿名为 'xxx'"))
     if CARD_RE.search(content):
         e.append(
@@ -470,26 +510,25 @@ def _check_R6(path: str, i: int, content: str) -> List[ErrorItem]:
         )
     if SSN_RE.search(content):
         e.append(ErrorItem(path, i, TAG["R6"], "检测到社会安全号明文，应匿名为 'xxx'"))
-    return e
 
 
-def _check_R7_R8_placeholder(path: str, i: int) -> List[ErrorItem]:
-    return []
+def _check_R7_R8_placeholder(e: List[ErrorItem], path: str, i: int) -> None:
+    pass
 
 
-def _check_text_norms(path: str, i: int, content: str) -> List[ErrorItem]:
-    e: List[ErrorItem] = []
-    if re.search(r"(?m)^\s*[\-\*\u25A2]\s+\S", content):  # -, *, ▢
+def _check_text_norms(e: List[ErrorItem], path: str, i: int, content: str) -> None:
+    if (
+        "-" in content or "*" in content or "\u25a2" in content
+    ) and LIST_PREFIX_RE.search(content):
         e.append(
             ErrorItem(
                 path, i, TAG["R3"], "仍存在列表前缀（-/*/▢ 等），应在清洗阶段去除"
             )
         )
-    return e
 
 
-def _check_failback(path: str, i: int, content: str) -> List[ErrorItem]:
-    return []
+def _check_failback(e: List[ErrorItem], path: str, i: int, content: str) -> None:
+    pass
 
 
 def check_content_rules(path: str, i: int, obj: dict) -> List[ErrorItem]:
@@ -501,35 +540,42 @@ def check_content_rules(path: str, i: int, obj: dict) -> List[ErrorItem]:
         e.append(ErrorItem(path, i, TAG["R1"], "`meta.data_info.content` 必须为字符串"))
         return e
 
-    e += _check_R2(path, i, content)
-    e += _check_R3(path, i, content, lang)
-    e += _check_R4(path, i, content)
-    e += _check_R5(path, i, content)
-    e += _check_R6(path, i, content)
-    e += _check_R7_R8_placeholder(path, i)
-    e += _check_text_norms(path, i, content)
-    e += _check_failback(path, i, content)
+    # 小写副本每条记录只做一次，R2/R4 的关键字检查共用
+    content_low = content.lower()
+    # 各子检查直接往 e 里追加：无错误的记录（常见情况）不再为每项检查新建空列表
+    _check_R2(e, path, i, content, content_low)
+    _check_R3(e, path, i, content, lang)
+    _check_R4(e, path, i, content, content_low)
+    _check_R5(e, path, i, content)
+    _check_R6(e, path, i, content)
+    _check_R7_R8_placeholder(e, path, i)
+    _check_text_norms(e, path, i, content)
+    _check_failback(e, path, i, content)
 
     return e
 
 
-def check_cross_file_ids(all_records: List[Tuple[str, int, dict]]) -> List[ErrorItem]:
+def normalize_id(obj: dict) -> str:
+    """跨文件查重用的 id 键；空串表示无 id（不参与查重）。"""
+    return str(obj.get("id", "")).lower()
+
+
+def check_cross_file_ids(all_ids: List[Tuple[str, int, str]]) -> List[ErrorItem]:
+    """all_ids：(path, line, normalize_id(obj))。"""
     e: List[ErrorItem] = []
     seen: Dict[str, Tuple[str, int]] = {}
-    for path, line, obj in all_records:
-        idv = str(obj.get("id", ""))
-        if not idv:
+    for path, line, key in all_ids:
+        if not key:
             continue
-        key = idv.lower()
-        if key in seen:
-            op, ol = seen[key]
+        loc = (path, line)
+        first = seen.setdefault(key, loc)  # 一次哈希查找：首次出现即登记
+        if first is not loc:
+            op, ol = first
             e.append(
                 ErrorItem(
                     path, line, TAG["DUP_ID"], f"跨文件重复 id（首次见于 {op}:{ol}）"
                 )
             )
-        else:
-            seen[key] = (path, line)
     return e
 
 
@@ -540,54 +586,44 @@ def check_file_dup_urls(path: str, objs: List[Tuple[int, dict]]) -> List[ErrorIt
         url = str(obj.get("meta", {}).get("data_info", {}).get("url", "")).strip()
         if not url:
             continue
-        key = url
-        if key in seen:
+        first = seen.setdefault(url, line)
+        if first != line:
             e.append(
                 ErrorItem(
                     path,
                     line,
                     TAG["DUP_URL"],
-                    f"同文件重复 URL（首次见于行 {seen[key]}）",
+                    f"同文件重复 URL（首次见于行 {first}）",
                 )
             )
-        else:
-            seen[key] = line
     return e
 
 
-def validate_paths(paths: List[str], strict: bool) -> List[ErrorItem]:
-    all_errors: List[ErrorItem] = []
-    cross_records: List[Tuple[str, int, dict]] = []
-
-    # 通过率统计
-    overall_total = 0
-    overall_passed = 0
-
-    for p in paths:
-        lines, err = safe_readlines(p)
-        per_file_errors: List[ErrorItem] = []
-        per_file_objs: List[Tuple[int, dict]] = []
-
-        per_file_errors += check_file_format(p, lines, err)
-        if lines is None:
-            write_report(p, per_file_errors, passed=0, total=0)
-            all_errors += per_file_errors
-            continue
-        per_file_errors += check_file_linecount(p, lines, strict=strict)
+def validate_file(
+    p: str, strict: bool
+) -> Tuple[List[ErrorItem], List[Tuple[str, int, str]], int, int]:
+    """单文件校验并写 .report.txt；返回 (错误, 供跨文件查重的 id, 条数, 通过条数)。
+    只依赖本文件内容，可在子进程里跑。"""
+    per_file_errors: List[ErrorItem] = []
+    per_file_objs: List[Tuple[int, dict]] = []
 
-        file_total = 0
-        file_passed = 0
+    file_total = 0
+    file_passed = 0
+    n_lines = 0
 
-        for idx, raw in enumerate(lines, 1):
-            raw = raw.rstrip("\n")
-            if not raw.strip():
+    try:
+        for idx, raw in enumerate(iter_lines(p), 1):
+            n_lines = idx
+            # iter_lines 不产出空串：isspace() 即"空行"，不必先 rstrip 再 strip 两次复制
+            if raw.isspace():
                 per_file_errors.append(
                     ErrorItem(p, idx, TAG["R1"], "空行/非 JSON 对象")
                 )
                 continue
             file_total += 1
             try:
-                obj = json.loads(raw)
+                # 行尾换行去掉再解析：出错时报的位置仍是"第 1 行第 N 列"
+                obj = orjson.loads(raw.rstrip("\n"))
             except Exception as ex:
                 per_file_errors.append(
                     ErrorItem(p, idx, TAG["R1"], f"JSON 解析失败：{ex}")
@@ -595,7 +631,6 @@ def validate_paths(paths: List[str], strict: bool) -> List[ErrorItem]:
                 continue
 
             per_file_objs.append((idx, obj))
-            cross_records.append((p, idx, obj))
 
             errs_before = len(per_file_errors)
 
@@ -607,16 +642,43 @@ def validate_paths(paths: List[str], strict: bool) -> List[ErrorItem]:
             # 若该对象无新增错误，计为通过
             if len(per_file_errors) == errs_before:
                 file_passed += 1
+    except (OSError, UnicodeDecodeError) as ex:
+        # 边读边校验：中途读/解码失败时丢弃该文件已有结果，只报这一条（同整读时）
+        per_file_errors = check_file_format(p, f"无法以 UTF-8 打开：{ex}")
+        write_report(p, per_file_errors, passed=0, total=0)
+        return per_file_errors, [], 0, 0
+
+    # 行数读完才知道；文件级错误仍排在逐行错误之前
+    per_file_errors[:0] = check_file_linecount(p, n_lines, strict=strict)
+    # id 在子进程里就规范化好，主进程查重时不再逐条 str()/lower()
+    ids = [(p, idx, normalize_id(obj)) for idx, obj in per_file_objs]
+    per_file_errors += check_file_dup_urls(p, per_file_objs)
+
+    # 写单文件报告
+    write_report(p, per_file_errors, passed=file_passed, total=file_total)
+    return per_file_errors, ids, file_total, file_passed
 
-        per_file_errors += check_file_dup_urls(p, per_file_objs)
 
-        # 写单文件报告 + 汇总通过率
-        write_report(p, per_file_errors, passed=file_passed, total=file_total)
-        overall_total += file_total
-        overall_passed += file_passed
-        all_errors += per_file_errors
+def validate_paths(paths: List[str], strict: bool) -> List[ErrorItem]:
+    all_errors: List[ErrorItem] = []
+    cross_ids: List[Tuple[str, int, str]] = []
+
+    # 通过率统计
+    overall_total = 0
+    overall_passed = 0
 
-    all_errors += check_cross_file_ids(cross_records)
+    # 各文件互不依赖：用进程池并行校验；跨文件 id 查重回到主进程按原顺序合并
+    workers = min(len(paths), os.cpu_count() or 1) or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for errs, ids, total, passed in pool.map(
+            partial(validate_file, strict=strict), paths
+        ):
+            all_errors += errs
+            cross_ids += ids
+            overall_total += total
+            overall_passed += passed
+
+    all_errors += check_cross_file_ids(cross_ids)
 
     if len(paths) > 1:
         merged = os.path.commonpath(paths)